@@ -1,22 +1,37 @@
-import os
 import re
 import sys
-import time
 import shutil
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Union
-import copy
 import wcwidth
 
-if sys.platform == "win32":
-    import ctypes
+_vt_enabled = False
 
-    kernel32 = ctypes.windll.kernel32
-    kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
 
+def _enable_vt_mode():
+    """Puts the Windows console into VT mode on first use; no-op elsewhere and on re-entry."""
+    global _vt_enabled
+    if _vt_enabled:
+        return
+    _vt_enabled = True
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
+
+
+_CLEAR = "\x1b[H\x1b[2J"
+_TOKEN_RE = re.compile(r'\S+|\s+')
+_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+@lru_cache(maxsize=1024, typed=True)
 def text_color(r, g, b):
     return f"\033[38;2;{r};{g};{b}m"
 
 
+@lru_cache(maxsize=1024, typed=True)
 def background_color(r, g, b):
     return f"\033[48;2;{r};{g};{b}m"
 
@@ -25,26 +40,40 @@ def is_rgb(value):
     if not (isinstance(value, tuple) and len(value) == 3):
         return False
     for x in value:
-        if isinstance(x, float):
-            if not 0.0 <= x <= 255.0:
-                return False
-        elif isinstance(x, int):
+        if isinstance(x, int):
             if not 0 <= x <= 255:
                 return False
+        elif isinstance(x, float):
+            if not 0.0 <= x <= 255.0:
+                return False
         else:
             return False
     return True
 
 
 def blend_shadow(bg, fg, intensity=0.3):
-    return tuple(
-        int(bg[i] * (1 - intensity) + fg[i] * intensity)
-        for i in range(3)
+    keep = 1 - intensity
+    return (
+        int(bg[0] * keep + fg[0] * intensity),
+        int(bg[1] * keep + fg[1] * intensity),
+        int(bg[2] * keep + fg[2] * intensity),
     )
 
 
+_WIDTH_CACHE: dict[str, int] = {chr(i): 1 for i in range(0x20, 0x7F)}
+
+
+def _char_width(ch):
+    width = _WIDTH_CACHE.get(ch)
+    if width is None:
+        width = _WIDTH_CACHE[ch] = wcwidth.wcwidth(ch)
+    return width
+
+
 def visual_width(s):
-    return sum(wcwidth.wcwidth(ch) for ch in s)
+    if s.isascii() and s.isprintable():
+        return len(s)
+    return sum(_char_width(ch) for ch in s)
 
 
 class TuixEngine():
@@ -112,6 +141,7 @@ class Styles():
     def set_style(self, style: str):
         if style in self.styles:
             self.style = style
+            self._cache_styles()
         else:
             raise ValueError(f"Unknown prompt style \"{style}\"")
 
@@ -189,15 +219,11 @@ class Styles():
         self._cache_styles()
 
     def define_style(self, *, name: str, config: dict):
-        keys = []
-        new_keys = []
-        for name_, data in self.styles_config["classic"].items():
-            keys.append(name_)
-        for name_, data in config.items():
-            new_keys.append(name_)
-
-        if set(keys) != set(new_keys):
+        if set(self.styles_config["classic"]) != set(config):
             raise ValueError("Style config keys do not match the required keys")
+        for key in ["selected_background", "selected_text"]:
+            if not is_rgb(config[key]):
+                raise ValueError(f"Style config key \"{key}\" must be rgb tuple")
 
         if name not in self.styles_config:
             self.styles_config[name] = config
@@ -209,18 +235,23 @@ class Styles():
         Computes and returns the fully resolved style dictionary
         (after applying preset + custom cascade) for RenderAPI consumption.
         """
-        precomputed_styles = copy.deepcopy(self.styles_config[self.style])
-        styles_config = []
-        for name, data in self.styles_config[self.style].items():
-            styles_config.append(name)
+        source = self.styles_config[self.style]
+        precomputed_styles = {name: (dict(data) if isinstance(data, dict) else data) for name, data in source.items()}
+        valid_keys = source.keys()
 
         for name, data in self.custom_styles.items():
-            if name not in styles_config:
+            if name not in valid_keys:
                 raise ValueError(f"Unknown style key \"{name}\"")
 
             if data != None:
                 precomputed_styles[name] = data
 
+        precomputed_styles["_esc"] = {
+            "selected": background_color(*precomputed_styles["selected_background"])
+                        + text_color(*precomputed_styles["selected_text"]),
+            "reset": "\x1b[0m"
+        }
+
         return precomputed_styles
 
     def _cache_styles(self):
@@ -258,6 +289,7 @@ class ComponentAPI:
             "progress": ["progress_bar"],
             "default_text": ["text_input"]
         }
+        self._valid = {(type, param) for param, types in self.properties.items() for type in types}
 
     def create(self, type: str, id: str, classes: list = []):
         if id in self.objects:
@@ -280,11 +312,11 @@ class ComponentAPI:
     def set_property(self, *, id: str, param: str, value):
         if id not in self.objects:
             raise ValueError(f"Object with id \"{id}\" does not exist")
-        if param not in self.properties:
-            raise ValueError(f"Unknown property name \"{param}\"")
-        if self.objects[id]["type"] not in self.properties[param]:
-            raise ValueError(
-                f"Property \"{param}\" is not applicable for object type \"{self.objects[id]['type']}\"")
+        type = self.objects[id]["type"]
+        if (type, param) not in self._valid:
+            if param not in self.properties:
+                raise ValueError(f"Unknown property name \"{param}\"")
+            raise ValueError(f"Property \"{param}\" is not applicable for object type \"{type}\"")
         self.objects[id][param] = value
 
     def get(self, id: str):
@@ -351,6 +383,7 @@ class LayoutEngine():
                     raise ValueError(f"\"{param}\" parameter must be between 0.0 and 1.0")
 
                 self.objects[id]["layout"][param] = value
+        self.objects[id]["layout"].pop("_cache_key", None)
 
     def margin_mode(self, *, id: str, param: Union[str, list], mode: str):
         if id not in self.objects:
@@ -370,43 +403,58 @@ class LayoutEngine():
     def _compute_all(self):
         terminal_cols, terminal_rows = shutil.get_terminal_size()
         for id, obj in self.objects.items():
-            width_modifier = self.objects[id]["layout"]["width_modifier"]
-            height_modifier = self.objects[id]["layout"]["height_modifier"]
-            margin_top = self.objects[id]["layout"]["margin_top_modifier"]
-            margin_left = self.objects[id]["layout"]["margin_left_modifier"]
-            self.objects[id]["layout"] = {
-                "width_modifier": width_modifier,
-                "height_modifier": height_modifier,
-                "margin_top_modifier": margin_top,
-                "margin_left_modifier": margin_left,
-                "margin_top_mode": obj["layout"]["margin_top_mode"],
-                "margin_left_mode": obj["layout"]["margin_left_mode"],
-                "x": int(width_modifier * terminal_cols),
-                "y": int(height_modifier * terminal_rows),
-                "margin_top": int(margin_top * terminal_rows) if obj["layout"]["margin_top_mode"] == "custom" else (terminal_rows - int(height_modifier * terminal_rows)) // 2,
-                "margin_left": int(margin_left * terminal_cols) if obj["layout"]["margin_left_mode"] == "custom" else (terminal_cols - int(width_modifier * terminal_cols)) // 2,
-                "corners": {
-                    "top_left": (int(margin_left * terminal_cols), int(margin_top * terminal_rows)),
-                    "bottom_right": (int((margin_left + width_modifier) * terminal_cols),
-                                     int((margin_top + height_modifier) * terminal_rows))
-                }
+            layout = obj["layout"]
+            width_modifier = layout["width_modifier"]
+            height_modifier = layout["height_modifier"]
+            margin_top = layout["margin_top_modifier"]
+            margin_left = layout["margin_left_modifier"]
+            margin_top_mode = layout["margin_top_mode"]
+            margin_left_mode = layout["margin_left_mode"]
+            cache_key = (terminal_cols, terminal_rows, width_modifier, height_modifier, margin_top, margin_left,
+                         margin_top_mode, margin_left_mode)
+            if layout.get("_cache_key") == cache_key:
+                continue
+
+            x = int(width_modifier * terminal_cols)
+            y = int(height_modifier * terminal_rows)
+            layout["_cache_key"] = cache_key
+            layout["x"] = x
+            layout["y"] = y
+            layout["margin_top"] = int(margin_top * terminal_rows) if margin_top_mode == "custom" else (terminal_rows - y) // 2
+            layout["margin_left"] = int(margin_left * terminal_cols) if margin_left_mode == "custom" else (terminal_cols - x) // 2
+            layout["corners"] = {
+                "top_left": (int(margin_left * terminal_cols), int(margin_top * terminal_rows)),
+                "bottom_right": (int((margin_left + width_modifier) * terminal_cols),
+                                 int((margin_top + height_modifier) * terminal_rows))
             }
 
+            pad_left, inner = " " * layout["margin_left"], x - 2
+            layout["_pad_left"] = pad_left
+            layout["_top_border"] = pad_left + "┏" + "━" * inner + "┓\n"
+            layout["_bot_border"] = pad_left + "┗" + "━" * inner + "┛\n"
+            layout["_blank_row"] = pad_left + "┃" + " " * inner + "┃\n"
+
 class RenderEngine:
     def __init__(self, main):
         self.main = main
         self.objects = self.main.components.objects
         self.selected_row = 0
         self.selected_index = 0
+        self._wrap_cache: OrderedDict[tuple[str, int], list[str]] = OrderedDict()
+        self._wrap_cache_size = 128
+        self._buf: list[str] = []
+        self._last_rendered = None
+        self._last_size = None
 
     def draw(self):
-        os.system("cls" if sys.platform == "win32" else "clear")
+        _enable_vt_mode()
+        self._buf.clear()
         self.main.layout._compute_all()
         if len(self.objects) == 1:
             for key, obj in self.objects.items():
                 if obj["type"] == "choice":
-                    print("\n" * obj["layout"]["margin_top"], end="")
-                    print(" " * obj["layout"]["margin_left"] + "┏" + "━" * (obj["layout"]["x"] - 2) + "┓")
+                    self._buf.append("\n" * obj["layout"]["margin_top"])
+                    self._buf.append(obj["layout"]["_top_border"])
                     self._draw_choice(obj, obj["label"])
                 else:
                     raise NotImplementedError("Only choice prompt is available now")
@@ -416,11 +464,27 @@ class RenderEngine:
             raise NotImplementedError("Multi-modal layout system is still in development")
 
     def _wrap_and_center(self, text: str, max_width: int) -> list[str]:
-        """Wraps text to max_width, but centers block horizontally."""
+        """Wraps text to max_width, but centers block horizontally.
+        Results are memoized per (text, max_width); a terminal resize changes max_width
+        and therefore misses the cache naturally.
+        """
+        key = (text, max_width)
+        cache = self._wrap_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        lines = self._compute_wrap_and_center(text, max_width)
+        cache[key] = lines
+        if len(cache) > self._wrap_cache_size:
+            cache.popitem(last=False)
+        return lines
+
+    def _compute_wrap_and_center(self, text: str, max_width: int) -> list[str]:
         tokens = []
         for part in text.split("\n"):
             if part:
-                tokens.extend(re.findall(r'\S+|\s+', part))
+                tokens.extend(_TOKEN_RE.findall(part))
             tokens.append("\n")
 
         lines, current, line_len = [], "", 0
@@ -453,6 +517,10 @@ class RenderEngine:
             raise ValueError("Choices list can't be empty")
 
         layout = obj["layout"]
+        buf = self._buf
+        pad_left = layout["_pad_left"]
+        x = layout["x"]
+        inner_blank = layout["_blank_row"]
         rendered_rows = []
 
         for row in choices:
@@ -460,15 +528,17 @@ class RenderEngine:
             for choice in row:
                 text = choice["name"]
                 if visual_width(text) > max_width - 4:
-                    chunk, pieces = "", []
-                    for ch in text:
-                        if visual_width(chunk + ch) >= max_width - 4:
-                            pieces.append(chunk)
-                            chunk = ch
+                    limit = max_width - 4
+                    pieces, start, acc = [], 0, 0
+                    for i, ch in enumerate(text):
+                        width = _char_width(ch)
+                        if acc + width >= limit:
+                            pieces.append(text[start:i])
+                            start, acc = i, width
                         else:
-                            chunk += ch
-                    if chunk:
-                        pieces.append(chunk)
+                            acc += width
+                    if start < len(text):
+                        pieces.append(text[start:])
                     text = " ".join(pieces)
                 row_parts.append(text)
             rendered_rows.append("    ".join(row_parts))
@@ -487,66 +557,85 @@ class RenderEngine:
                 "y_offset": start_y + idx,
             })
 
-        print(
-            (" " * layout["margin_left"] + "┃" + " " * (layout["x"] - 2) + "┃\n")
-            * (max_height - len(lines_to_render) * 2),
-            end="",
-        )
+        buf.extend([inner_blank] * (max_height - len(lines_to_render) * 2))
 
+        selected_row = self.selected_row
+        selected_index = self.selected_index
+        esc = self.main.styles.cached_styles["_esc"]
         for row_idx, line in enumerate(lines_to_render):
             inner_space_left = " " * line["left_offset"]
             inner_space_right = " " * (
-                layout["x"] - 2 - line["left_offset"] - visual_width(line["text"])
+                x - 2 - line["left_offset"] - visual_width(line["text"])
             )
 
-            if row_idx == self.selected_row:
-                highlighted = ""
-                segments = line["text"].split("    ")
-                for idx, segment in enumerate(segments):
-                    if idx == self.selected_index:
-                        background_col = self.main.styles.custom_styles['selected_background'] if is_rgb(self.main.styles.custom_styles['selected_background']) else self.main.styles.styles_config[self.main.styles.style]['selected_background']
-                        text_col = self.main.styles.custom_styles['selected_text'] if is_rgb(self.main.styles.custom_styles['selected_text']) else self.main.styles.styles_config[self.main.styles.style]['selected_text']
-
-                        highlighted += (("    " if idx != 0 else "") + f"{background_color(*background_col)}{text_color(*text_col)}{segment.strip()}\x1b[0m" + ("    " if idx == 0 else ""))
-                    else:
-                        highlighted += f"{segment.strip()}"
-                line_text = highlighted.rstrip()
+            if row_idx == selected_row:
+                segments = [segment.strip() for segment in line["text"].split("    ")]
+                if selected_index < len(segments):
+                    segments[selected_index] = f"{esc['selected']}{segments[selected_index]}{esc['reset']}"
+                line_text = "    ".join(segments)
             else:
                 line_text = line["text"]
 
-            print(
-                " " * layout["margin_left"]
-                + "┃"
-                + inner_space_left
-                + line_text
-                + inner_space_right
-                + "┃"
-            )
-            print(
-                " " * layout["margin_left"] + "┃" + " " * (layout["x"] - 2) + "┃"
-            )
+            buf.append(pad_left + "┃" + inner_space_left + line_text + inner_space_right + "┃\n")
+            buf.append(inner_blank)
 
     def _draw_choice(self, obj, text: str):
-        text = self._wrap_and_center(text=text, max_width=(obj["layout"]["x"] - 4))
         layout = obj["layout"]
+        buf = self._buf
+        pad_left = layout["_pad_left"]
+        x = layout["x"]
+        inner_blank = layout["_blank_row"]
+        text = self._wrap_and_center(text=text, max_width=(x - 4))
 
-        print(" " * layout["margin_left"] + "┃" + " " * (layout["x"] - 2) + "┃")
+        buf.append(inner_blank)
         for line in text:
-            print(" " * layout["margin_left"] + "┃ " + line + " ┃")
-        print(" " * layout["margin_left"] + "┃" + " " * (layout["x"] - 2) + "┃")
+            buf.append(pad_left + "┃ " + line + " ┃\n")
+        buf.append(inner_blank)
 
         self._draw_buttons(
             obj=obj,
             choices=obj["choices"],
             max_height=(layout["y"] - len(text) - 5),
-            max_width=(layout["x"] - 4),
+            max_width=(x - 4),
         )
 
-        print(" " * layout["margin_left"] + "┃" + " " * (layout["x"] - 2) + "┃")
-        print(" " * layout["margin_left"] + "┗" + "━" * (layout["x"] - 2) + "┛")
+        buf.append(inner_blank)
+        buf.append(layout["_bot_border"])
 
+        self._flush()
         self.main.input.listen(choices=obj["choices"])
 
+    def _flush(self):
+        """
+        Writes the buffered frame to stdout in a single call.
+        Only rows that differ from the previous frame are rewritten; the screen is cleared and
+        fully redrawn on the first frame, after a resize, when the frame shape changes or when
+        any line is wider than the terminal (wrapped lines break row addressing).
+        """
+        frame = "".join(self._buf)
+        self._buf.clear()
+        lines = frame.split("\n")
+        size = shutil.get_terminal_size()
+        last = self._last_rendered
+        fits = len(lines) <= size.lines and all(
+            visual_width(_ESCAPE_RE.sub("", line)) <= size.columns for line in lines)
+
+        if last is None or not fits or size != self._last_size or len(lines) != len(last):
+            output = _CLEAR + frame
+        else:
+            output = "".join(f"\x1b[{row + 1};1H\x1b[2K{line}" for row, (line, old) in enumerate(zip(lines, last))
+                             if line != old)
+            output += f"\x1b[{len(lines)};1H"
+
+        self._last_rendered = lines if fits else None
+        self._last_size = size
+        sys.stdout.write(output)
+        sys.stdout.flush()
+
+    def _invalidate_frame(self):
+        """Forces the next frame to be a full redraw, e.g. after the screen was cleared externally."""
+        self._last_rendered = None
+
     def _handle_selection_change(self, key: str, choices: list):
         if not choices:
             return
@@ -576,7 +665,6 @@ class RenderEngine:
         if selected_index is not None:
             self.selected_index = selected_index
 
-        os.system("cls" if sys.platform == "win32" else "clear")
         self.draw()
 
 class InputHandler:
@@ -585,56 +673,75 @@ class InputHandler:
         self.selected_row = 0
         self.selected_index = 0
         self.running = True
+        self._term_settings = None
 
     def get_key(self):
         if sys.platform == "win32":
             import msvcrt
-            if msvcrt.kbhit():
+            key = msvcrt.getch()
+            if key in (b"\xe0", b"\x00"):
                 key = msvcrt.getch()
-                if key in (b"\xe0", b"\x00"):
-                    key = msvcrt.getch()
-                    code = key.decode(errors="ignore")
+                code = key.decode(errors="ignore")
+                mapping = {
+                    "H": "up",
+                    "P": "down",
+                    "K": "left",
+                    "M": "right"
+                }
+                return mapping.get(code)
+            elif key in (b"\r", b"\n"):
+                return "enter"
+            return None
+
+        else:
+            if self._term_settings is None:
+                # Called outside listen(): switch to cbreak mode just for this read.
+                return self._in_cbreak_mode(self.get_key)
+
+            import select, sys as _sys
+            rlist, _, _ = select.select([_sys.stdin], [], [], None)
+            if rlist:
+                ch = _sys.stdin.read(1)
+                if ch == "\x1b":
+                    seq = _sys.stdin.read(2)
                     mapping = {
-                        "H": "up",
-                        "P": "down",
-                        "K": "left",
-                        "M": "right"
+                        "[A": "up",
+                        "[B": "down",
+                        "[C": "right",
+                        "[D": "left"
                     }
-                    return mapping.get(code)
-                elif key in (b"\r", b"\n"):
+                    return mapping.get(seq)
+                elif ch in ["\r", "\n"]:
                     return "enter"
             return None
 
-        else:
-            import termios, tty, select, sys as _sys
-            fd = _sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
-            try:
-                tty.setraw(fd)
-                rlist, _, _ = select.select([_sys.stdin], [], [], 0.1)
-                if rlist:
-                    ch = _sys.stdin.read(1)
-                    if ch == "\x1b":
-                        seq = _sys.stdin.read(2)
-                        mapping = {
-                            "[A": "up",
-                            "[B": "down",
-                            "[C": "right",
-                            "[D": "left"
-                        }
-                        return mapping.get(seq)
-                    elif ch in ["\r", "\n"]:
-                        return "enter"
-                return None
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-
-
-    def listen(self, choices:list):
+    def listen(self, choices: list):
+        """
+        Switches the terminal to cbreak mode once for the whole session and restores it on exit.
+        Nested calls (listen -> _refresh -> draw -> listen) reuse the mode set by the outermost call.
+        """
+        if sys.platform == "win32" or self._term_settings is not None:
+            self._listen(choices)
+            return
+
+        self._in_cbreak_mode(self._listen, choices)
+
+    def _in_cbreak_mode(self, func, *args):
+        """Internal API. Runs func with the POSIX terminal in cbreak mode and restores the previous mode afterwards."""
+        import termios, tty
+        fd = sys.stdin.fileno()
+        self._term_settings = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            return func(*args)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, self._term_settings)
+            self._term_settings = None
+
+    def _listen(self, choices: list):
         while self.running:
             key = self.get_key()
             if not key:
-                time.sleep(0.05)
                 continue
 
             if key == "up":
@@ -648,8 +755,9 @@ class InputHandler:
             elif key == "right":
                 self.selected_index = min(len(choices[self.selected_row]) - 1, self.selected_index + 1)
             elif key == "enter":
-                os.system("cls" if sys.platform == "win32" else "clear")
+                sys.stdout.write(_CLEAR)
                 print(f"Selected index: {self.selected_index}")
+                self.main.render._invalidate_frame()
                 self.running = False
 
             self.main.render._refresh(selected_row=self.selected_row, selected_index=self.selected_index)